@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+# parametros globales
+from params import *
+
+# pasos de carga, en orden; el progreso se reporta sobre esta lista
+STEPS = ('renewable_share_energy', 'share_electricity_renewables', 'entities', 'plotly')
+
+DATASETS = {
+    'renewable_share_energy': RENEWABLE_SHARE_ENERGY_PATH,
+    'share_electricity_renewables': SHARE_ELECTRICITY_RENEWABLES_PATH,
+}
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_data = {}
+_state = {
+    'status': 'idle',
+    'mode': None,
+    'step': None,
+    'steps_done': 0,
+    'error': None,
+    'started_at': None,
+    'finished_at': None,
+}
+
+
+def _run_step(step: str):
+    """
+    Executes a single loading step and stores its result.
+
+    Parameters
+    ----------
+    step : str
+        One of the names in `STEPS`.
+    """
+    if step in DATASETS:
+        import pandas as pd
+        _data[step] = pd.read_csv(DATASETS[step])
+    elif step == 'entities':
+        # obtenemos las entidades disponibles una sola vez
+        _data['entities'] = list(_data['renewable_share_energy']['Entity'].unique())
+    elif step == 'plotly':
+        # precalentamos los módulos de graficación para que el primer callback no pague la importación
+        import plotly.express  # noqa: F401
+        import plotly.graph_objects  # noqa: F401
+
+
+def load():
+    """
+    Loads every dataset and heavy module listed in `STEPS`.
+
+    Safe to call from several threads: the first caller does the work and the rest block until it
+    finishes. Calling it after a successful load is a no-op; calling it after a failed load retries.
+    """
+    with _lock:
+        if _ready.is_set():
+            return
+        _state.update(status='loading', step=None, steps_done=0, error=None,
+                      started_at=time.monotonic(), finished_at=None)
+        try:
+            for step in STEPS:
+                _state['step'] = step
+                _run_step(step)
+                _state['steps_done'] += 1
+        except Exception as error:
+            _state.update(status='error', error=repr(error), finished_at=time.monotonic())
+            raise
+        _state.update(status='ready', step=None, finished_at=time.monotonic())
+        _ready.set()
+
+
+def start(mode: str = STARTUP_MODE):
+    """
+    Starts loading the data according to the startup mode.
+
+    Parameters
+    ----------
+    mode : str
+        'eager' loads everything before returning, 'background' loads on a daemon thread and 'lazy'
+        defers the load until the first call to `get`.
+    """
+    if mode not in ('eager', 'background', 'lazy'):
+        raise ValueError(f"Unknown startup mode: {mode!r}")
+    _state['mode'] = mode
+    if mode == 'eager':
+        load()
+    elif mode == 'background':
+        _start_thread()
+
+
+def _start_thread():
+    _state['status'] = 'loading'
+    threading.Thread(target=load, name='data-loader', daemon=True).start()
+
+
+def _before_fork():
+    # esperamos a que termine una carga en curso: el hilo cargador no existe en el proceso hijo
+    _lock.acquire()
+
+
+def _after_fork_in_parent():
+    _lock.release()
+
+
+def _after_fork_in_child():
+    """
+    Makes the loading per-process after a fork (e.g. workers of `gunicorn --preload`).
+
+    Data loaded before the fork is inherited as is. Otherwise the child starts over and, in 'background'
+    mode, launches its own loader thread instead of waiting for the parent's, which does not exist here.
+    """
+    _lock.release()
+    if _ready.is_set():
+        return
+    _data.clear()
+    _state.update(status='idle', step=None, steps_done=0, error=None, started_at=None, finished_at=None)
+    if _state['mode'] == 'background':
+        _start_thread()
+
+
+os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                    after_in_child=_after_fork_in_child)
+
+
+def get(name: str):
+    """
+    Returns a loaded object, loading it first if it is not available yet.
+
+    Parameters
+    ----------
+    name : str
+        'renewable_share_energy', 'share_electricity_renewables' or 'entities'.
+
+    Returns
+    -------
+    pd.DataFrame or list
+        The requested dataset or the list of available entities.
+    """
+    if not _ready.is_set():
+        load()
+    return _data[name]
+
+
+def wait(timeout: float = None) -> bool:
+    """
+    Blocks until the data is loaded or the timeout expires.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        Maximum number of seconds to wait. Waits indefinitely when None.
+
+    Returns
+    -------
+    bool
+        True if the data is ready.
+    """
+    return _ready.wait(timeout)
+
+
+def status() -> dict:
+    """
+    Reports the loading progress.
+
+    Returns
+    -------
+    dict
+        A dictionary with whether the data is ready, the status ('idle', 'loading', 'ready' or 'error'), the
+        startup mode, the current step, the completed fraction of `STEPS`, the elapsed loading time in
+        seconds and the last error.
+    """
+    state = dict(_state)
+    if state['started_at'] is None:
+        elapsed = None
+    else:
+        elapsed = (state['finished_at'] or time.monotonic()) - state['started_at']
+    return {
+        'ready': _ready.is_set(),
+        'status': state['status'],
+        'mode': state['mode'],
+        'step': state['step'],
+        'progress': state['steps_done'] / len(STEPS),
+        'elapsed_seconds': elapsed,
+        'error': state['error'],
+    }
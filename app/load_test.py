@@ -0,0 +1,511 @@
+"""
+Concurrent load generator for the dashboard callbacks.
+
+Usage (from the app/ directory):
+
+    python load_test.py [--clients 50] [--duration 60] [--workers 0] [--think-time 1.0] [--json out.json]
+
+Simulates many browser sessions with asyncio: each one switches tabs, changes the dropdowns, drags the
+sliders and receives interval ticks, POSTing the same payloads as the browser to `/_dash-update-component`.
+Unless `--url` is given, the app is started locally against synthetic data at the scale of the real files
+(or the real files, if their *_PATH variables are set), so the test runs fully offline.
+Reports errors, plus throughput and p50/p95/p99 latency of the successful requests, per callback; `--json`
+saves the report to compare runs (e.g. before and after a caching change).
+"""
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+# parametros globales
+from params import *
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+UPDATE_COMPONENT_PATH = '/_dash-update-component'
+# conexiones persistentes por sesión, como el pool por host de un navegador
+CONNECTIONS_PER_SESSION = 6
+
+# callbacks de main.py: nombre -> (salidas 'id.propiedad', entrada 'id.propiedad')
+CALLBACKS = {
+    'render_tab_content': (['tabs-content.children'], 'tabs.active_tab'),
+    'plot_lineplot': (['line-plot.figure'], 'drop-entity.value'),
+    'plot_scatterplot': (['scatter-plot.figure'], 'drop-entity.value'),
+    'plot_barplot': (['slider-output-container.children', 'bar-plot.figure'], 'my-slider.value'),
+    'plot_heatmap': (['slider-output-container-heatmap.children', 'heatmap-plot.figure'], 'slider-heatmap.value'),
+    'scatterplot_multiple': (['scatter-plot-line.children'], 'interval-component-2.n_intervals'),
+    'update_bar_plot_annual_renewable_rates': (['map-plots.children'], 'interval-component-3.n_intervals'),
+    'map_plot': (['bar-plot-annual-rates.children'], 'interval-component.n_intervals'),
+}
+
+# callbacks que el navegador dispara al montar el contenido de cada pestaña, con sus valores iniciales
+TABS = {
+    'line-plot-tab': [('plot_lineplot', DEFAULT_ENTITY), ('plot_heatmap', 6)],
+    'bar-plot-tab': [('plot_barplot', 10), ('map_plot', 0)],
+    'map-plot': [('plot_scatterplot', DEFAULT_ENTITY), ('scatterplot_multiple', 0),
+                 ('update_bar_plot_annual_renewable_rates', 0)],
+}
+
+# acciones disponibles en cada pestaña y su peso relativo en la mezcla de la sesión
+ACTION_WEIGHTS = {
+    'line-plot-tab': {'tab_switch': 1, 'dropdown': 3, 'slider_drag': 3},
+    'bar-plot-tab': {'tab_switch': 1, 'slider_drag': 4, 'interval_tick': 1},
+    'map-plot': {'tab_switch': 1, 'dropdown': 4, 'interval_tick': 1},
+}
+
+SLIDER_VALUES = [0, 5, 10, 15, 20]
+
+CONTINENTS = ['Africa', 'Europe', 'South America', 'North America', 'Oceania', 'Asia']
+COUNTRIES = ['Mexico', 'Germany', 'France', 'United Kingdom', 'Denmark', 'Spain', 'Brazil', 'Argentina',
+             'Chile', 'Colombia', 'Peru', 'Canada', 'United States', 'China', 'India', 'Japan', 'South Korea',
+             'Indonesia', 'Australia', 'New Zealand', 'Norway', 'Sweden', 'Finland', 'Iceland', 'Italy',
+             'Portugal', 'Poland', 'Turkey', 'Egypt', 'South Africa', 'Morocco', 'Kenya', 'Nigeria',
+             'Saudi Arabia', 'Iran', 'Pakistan', 'Vietnam', 'Thailand', 'Philippines', 'Russia']
+SYNTHETIC_ENTITIES = CONTINENTS + COUNTRIES + ['World']
+# tamaño similar al de los CSV reales de Our World in Data (~280 entidades entre países y regiones)
+SYNTHETIC_ENTITY_COUNT = 280
+SYNTHETIC_YEARS = range(1965, 2023)
+DATA_VARIABLES = ['RENEWABLE_SHARE_ENERGY_PATH', 'SHARE_ELECTRICITY_RENEWABLES_PATH']
+
+
+def write_synthetic_data(directory: str, seed: int = 0, entities: int = SYNTHETIC_ENTITY_COUNT) -> dict:
+    """
+    Writes synthetic versions of the two CSV files used by the dashboard.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where the files are written.
+    seed : int
+        Seed for the random walks that generate the renewable shares.
+    entities : int
+        Number of entities per file: the names in `SYNTHETIC_ENTITIES` followed by generated ones.
+
+    Returns
+    -------
+    dict
+        A dictionary with the environment variables that point the app to the synthetic files.
+    """
+    rng = random.Random(seed)
+    files = {
+        'RENEWABLE_SHARE_ENERGY_PATH': ('renewable-share-energy.csv',
+                                        'Renewables (% equivalent primary energy)'),
+        'SHARE_ELECTRICITY_RENEWABLES_PATH': ('share-electricity-renewables.csv',
+                                              'Renewables (% electricity)'),
+    }
+    names = SYNTHETIC_ENTITIES[:entities]
+    names += [f'Synthetic Entity {index:03d}' for index in range(entities - len(names))]
+    env = {}
+    for variable, (filename, column) in files.items():
+        path = os.path.join(directory, filename)
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Entity', 'Code', 'Year', column])
+            for entity in names:
+                # caminata aleatoria acotada a [0.1, 100] para cada entidad
+                share = rng.uniform(0.5, 40)
+                for year in SYNTHETIC_YEARS:
+                    share = min(100.0, max(0.1, share + rng.gauss(0.3, 1.5)))
+                    writer.writerow([entity, entity[:3].upper(), year, round(share, 3)])
+        env[variable] = path
+    return env
+
+
+class HttpClient:
+    """
+    Minimal asyncio HTTP/1.1 client over a single persistent (keep-alive) connection.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: dict = None) -> tuple:
+        """
+        Sends a request and reads the whole response.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        path : str
+            Request path.
+        body : dict, optional
+            JSON body.
+
+        Returns
+        -------
+        int, bytes
+            The HTTP status code and the response body.
+        """
+        reused = self._writer is not None
+        try:
+            return await self._request(method, path, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            # el servidor cerró la conexión persistente; reintentamos una vez con una nueva
+            return await self._request(method, path, body)
+
+    async def _request(self, method: str, path: str, body: dict) -> tuple:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        data = b'' if body is None else json.dumps(body).encode()
+        head = (f'{method} {path} HTTP/1.1\r\n'
+                f'Host: {self.host}:{self.port}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(data)}\r\n\r\n')
+        self._writer.write(head.encode() + data)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by the server')
+        version, status = status_line.split()[:2]
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
+
+        keep_alive = version == b'HTTP/1.1' and headers.get('connection') != 'close'
+        if 'content-length' in headers:
+            content = await self._reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding') == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b';')[0], 16)
+                chunks.append((await self._reader.readexactly(size + 2))[:size])
+                if size == 0:
+                    break
+            content = b''.join(chunks)
+        else:
+            content = await self._reader.read()
+            keep_alive = False
+        if not keep_alive:
+            self.close()
+        return int(status), content
+
+
+def build_payload(callback: str, value) -> dict:
+    """
+    Builds the body that the Dash renderer POSTs to `/_dash-update-component` for a callback.
+
+    Parameters
+    ----------
+    callback : str
+        A key of `CALLBACKS`.
+    value
+        The new value of the callback input.
+
+    Returns
+    -------
+    dict
+        The JSON body of the request.
+    """
+    outputs, input_ = CALLBACKS[callback]
+    parsed_outputs = [dict(zip(('id', 'property'), output.rsplit('.', 1))) for output in outputs]
+    input_id, input_property = input_.rsplit('.', 1)
+    if len(outputs) > 1:
+        # los callbacks con una lista de Output usan la notación '..a.b...c.d..'
+        output = '..' + '...'.join(outputs) + '..'
+    else:
+        output, parsed_outputs = outputs[0], parsed_outputs[0]
+    return {
+        'output': output,
+        'outputs': parsed_outputs,
+        'inputs': [{'id': input_id, 'property': input_property, 'value': value}],
+        'changedPropIds': [input_],
+        'state': [],
+    }
+
+
+class Session:
+    """
+    A simulated browser session with its own pool of connections, current tab and interval counters.
+    """
+
+    def __init__(self, host: str, port: int, prefix: str, rng: random.Random, results: list, timeout: float):
+        self.update_path = prefix + UPDATE_COMPONENT_PATH
+        self.clients = [HttpClient(host, port) for _ in range(CONNECTIONS_PER_SESSION)]
+        # LIFO: las peticiones secuenciales reutilizan la misma conexión y las paralelas toman otras del pool
+        self.idle = asyncio.LifoQueue()
+        for client in self.clients:
+            self.idle.put_nowait(client)
+        self.rng = rng
+        self.results = results
+        self.timeout = timeout
+        self.tab = None
+        self.n_intervals = 0
+
+    async def call(self, callback: str, value):
+        client = await self.idle.get()
+        start = time.perf_counter()
+        try:
+            status, _ = await asyncio.wait_for(
+                client.request('POST', self.update_path, build_payload(callback, value)), self.timeout)
+            ok = status == 200
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            client.close()
+            ok = False
+        finally:
+            self.idle.put_nowait(client)
+        self.results.append((callback, start, time.perf_counter() - start, ok))
+
+    async def call_many(self, calls: list):
+        # el navegador dispara en paralelo los callbacks independientes, repartidos en su pool de conexiones
+        await asyncio.gather(*(self.call(callback, value) for callback, value in calls))
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+
+    async def switch_tab(self, tab: str):
+        self.tab = tab
+        self.n_intervals = 0
+        await self.call('render_tab_content', tab)
+        await self.call_many(TABS[tab])
+
+    async def act(self):
+        weights = ACTION_WEIGHTS[self.tab]
+        action = self.rng.choices(list(weights), list(weights.values()))[0]
+        if action == 'tab_switch':
+            await self.switch_tab(self.rng.choice([tab for tab in TABS if tab != self.tab]))
+        elif action == 'dropdown' and self.tab == 'line-plot-tab':
+            await self.call('plot_lineplot', self.rng.sample(SYNTHETIC_ENTITIES, self.rng.randint(1, 4)))
+        elif action == 'dropdown':
+            await self.call('plot_scatterplot', self.rng.choice(SYNTHETIC_ENTITIES))
+        elif action == 'slider_drag':
+            # los sliders usan updatemode='mouseup': cada arrastre produce una sola petición
+            callback = 'plot_heatmap' if self.tab == 'line-plot-tab' else 'plot_barplot'
+            await self.call(callback, self.rng.choice(SLIDER_VALUES))
+        elif action == 'interval_tick':
+            self.n_intervals += 1
+            if self.tab == 'bar-plot-tab':
+                await self.call('map_plot', self.n_intervals)
+            else:
+                await self.call_many([('scatterplot_multiple', self.n_intervals),
+                                      ('update_bar_plot_annual_renewable_rates', self.n_intervals)])
+
+    async def run(self, deadline: float, think_time: float):
+        await self.switch_tab('line-plot-tab')
+        while True:
+            if think_time:
+                remaining = deadline - time.perf_counter()
+                await asyncio.sleep(max(0, min(self.rng.expovariate(1 / think_time), remaining)))
+            # volvemos a comprobar tras la pausa para no lanzar acciones fuera de la ventana medida
+            if time.perf_counter() >= deadline:
+                break
+            await self.act()
+        self.close()
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def summarize(results: list, start: float, end: float) -> dict:
+    """
+    Aggregates the recorded requests per callback.
+
+    Parameters
+    ----------
+    results : list
+        A list of (callback, start_time, latency_seconds, ok) tuples.
+    start, end : float
+        The measurement window; requests started outside of it are ignored.
+
+    Returns
+    -------
+    dict
+        A dictionary keyed by callback name (plus 'TOTAL') with the number of requests, errors,
+        throughput (successful requests per second) and mean/p50/p95/p99/max latency in milliseconds.
+        Failed requests count only as errors: they are excluded from the throughput and the latencies.
+    """
+    elapsed = end - start
+    groups = {}
+    for callback, started, latency, ok in results:
+        if start <= started < end:
+            groups.setdefault(callback, []).append((latency, ok))
+            groups.setdefault('TOTAL', []).append((latency, ok))
+
+    report = {}
+    for callback, rows in sorted(groups.items(), key=lambda item: item[0] == 'TOTAL'):
+        latencies = sorted(latency * 1000 for latency, ok in rows if ok)
+        stats = {
+            'requests': len(rows),
+            'errors': sum(1 for _, ok in rows if not ok),
+            'throughput': len(latencies) / elapsed,
+        }
+        for name, q in (('p50', 50), ('p95', 95), ('p99', 99)):
+            stats[name] = percentile(latencies, q) if latencies else None
+        stats['mean'] = sum(latencies) / len(latencies) if latencies else None
+        stats['max'] = latencies[-1] if latencies else None
+        report[callback] = stats
+    return report
+
+
+def print_report(report: dict):
+    def ms(value):
+        return f'{value:9.1f}' if value is not None else f'{"-":>9}'
+
+    print(f"{'callback':<40} {'requests':>8} {'errors':>6} {'ok req/s':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for callback, stats in report.items():
+        print(f"{callback:<40} {stats['requests']:8d} {stats['errors']:6d} {stats['throughput']:8.1f} "
+              f"{ms(stats['p50'])} {ms(stats['p95'])} {ms(stats['p99'])} {ms(stats['max'])}")
+
+
+async def wait_until_ready(host: str, port: int, prefix: str, timeout: float, process: subprocess.Popen = None):
+    """
+    Polls the `/health` endpoint (under the URL prefix) until it reports that the data is loaded.
+
+    Requires `"ready": true` in the JSON body, not just a 200: with a path prefix, a URL that misses the
+    health route is answered by Dash's catch-all route with the index page and a 200.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f'The app exited with code {process.returncode}')
+        client = HttpClient(host, port)
+        try:
+            status, content = await client.request('GET', prefix + '/health')
+            if status == 200 and json.loads(content).get('ready') is True:
+                return
+        except (OSError, ValueError, AttributeError):
+            pass
+        finally:
+            client.close()
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f'The app was not ready after {timeout} seconds')
+
+
+def start_app(port: int, workers: int, env: dict, log_path: str) -> subprocess.Popen:
+    """
+    Starts the app in a subprocess.
+
+    Parameters
+    ----------
+    port : int
+        Local port to listen on.
+    workers : int
+        Number of gunicorn worker processes; 0 uses the threaded Flask development server.
+    env : dict
+        Environment variables that override the current ones (e.g. the paths of the data).
+    log_path : str
+        File that receives the output of the server.
+
+    Returns
+    -------
+    subprocess.Popen
+        The server process.
+    """
+    if workers:
+        command = [sys.executable, '-m', 'gunicorn', '--workers', str(workers),
+                   '--bind', f'127.0.0.1:{port}', 'main:server']
+    else:
+        command = [sys.executable, '-c',
+                   "import logging, main; logging.getLogger('werkzeug').setLevel(logging.ERROR); "
+                   f"main.server.run(host='127.0.0.1', port={port}, threaded=True)"]
+    with open(log_path, 'w') as log:
+        return subprocess.Popen(command, cwd=APP_DIR, env=dict(os.environ, **env),
+                                stdout=log, stderr=subprocess.STDOUT)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def run_load(host: str, port: int, prefix: str, clients: int, duration: float, warmup: float,
+                   think_time: float, timeout: float, seed: int) -> dict:
+    """
+    Runs the simulated sessions and returns the per-callback report.
+    """
+    results = []
+    start = time.perf_counter()
+    deadline = start + warmup + duration
+    sessions = [Session(host, port, prefix, random.Random(seed + index), results, timeout)
+                for index in range(clients)]
+    await asyncio.gather(*(session.run(deadline, think_time) for session in sessions))
+    return summarize(results, start + warmup, deadline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='http:// URL of an already running app, including any path prefix '
+                                      '(requests_pathname_prefix); by default one is started locally')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='gunicorn workers for the local app (0 = threaded Flask server)')
+    parser.add_argument('--clients', type=int, default=50, help='number of concurrent simulated sessions')
+    parser.add_argument('--duration', type=float, default=60, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='seconds of load before measuring')
+    parser.add_argument('--think-time', type=float, default=1.0,
+                        help='mean pause between user actions in seconds (0 = no pauses)')
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--entities', type=int, default=SYNTHETIC_ENTITY_COUNT,
+                        help='entities in the synthetic data; RENEWABLE_SHARE_ENERGY_PATH and '
+                             'SHARE_ELECTRICITY_RENEWABLES_PATH, if set, point the local app to real data instead')
+    parser.add_argument('--json', help='file where the report is saved')
+    args = parser.parse_args()
+
+    prefix = ''
+    if args.url:
+        url = urlsplit(args.url)
+        if url.scheme != 'http' or not url.hostname:
+            parser.error('--url must be an http:// URL (HTTPS is not supported)')
+        host, port, prefix = url.hostname, url.port or 80, url.path.rstrip('/')
+
+    process = None
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.url:
+            host, port = '127.0.0.1', free_port()
+            env = write_synthetic_data(directory, args.seed, args.entities)
+            # las rutas que indique quien ejecuta la prueba tienen prioridad sobre los datos sintéticos
+            env.update({variable: os.environ[variable] for variable in DATA_VARIABLES if variable in os.environ})
+            log_path = os.path.join(directory, 'server.log')
+            process = start_app(port, args.workers, env, log_path)
+        try:
+            asyncio.run(wait_until_ready(host, port, prefix, timeout=120, process=process))
+            report = asyncio.run(run_load(host, port, prefix, args.clients, args.duration, args.warmup,
+                                          args.think_time, args.timeout, args.seed))
+        except Exception:
+            if process is not None:
+                with open(log_path) as log:
+                    print(log.read()[-4000:], file=sys.stderr)
+            raise
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'args': vars(args), 'report': report}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 
-import pandas as pd
 # Dash libraries
 import dash
+import flask
 from dash import dcc
 from dash import html
 import dash_bootstrap_components as dbc
@@ -17,21 +17,27 @@ from utils_dashboard import plot_scatterplot as plot_scatterplot_db
 from utils_dashboard import scatterplot_multiple as scatterplot_multiple_db
 from utils_dashboard import map_plot as map_plot_db
 
+import data_loader
 from params import *
 
-# leemos los datos como DataFrame
-renewable_share_energy = pd.read_csv("../data/01 renewable-share-energy.csv")
-share_electricity_renewables = pd.read_csv("../data/04 share-electricity-renewables.csv")
-
-# obtenemos las entidades disponibles
-renewable_share_energy['Entity'].unique()
-ENTITIES = list(renewable_share_energy['Entity'].unique())
+# leemos los datos según el modo de arranque (ver STARTUP_MODE en params.py)
+data_loader.start()
 
 # creamos una nueva aplicación Dash
 dash_app = dash.Dash(name=__name__,
                      title='Images & Video Dashboard',
                      external_stylesheets=[dbc.themes.BOOTSTRAP],
                      suppress_callback_exceptions=True)
+server = dash_app.server
+
+
+# bajo el mismo prefijo que las rutas de Dash (DASH_ROUTES_PATHNAME_PREFIX / DASH_URL_BASE_PATHNAME)
+@server.route(dash_app.config.routes_pathname_prefix + 'health')
+def health():
+    # listo solo con los datos cargados; en modo 'lazy' eso ocurre tras la primera petición que los usa
+    status = data_loader.status()
+    return flask.jsonify(status), 200 if status['ready'] else 503
+
 
 # Definimos el layout de la aplicación
 dash_app.layout = html.Div([
@@ -82,7 +88,7 @@ def render_tab_content(active_tab):
                         html.Label('Entidad/Región:'),
                         dcc.Dropdown(
                             id='drop-entity',
-                            options=[{'label': entity, 'value': entity} for entity in ENTITIES],
+                            options=[{'label': entity, 'value': entity} for entity in data_loader.get('entities')],
                             value=DEFAULT_ENTITY,
                             multi=True
                         )
@@ -176,7 +182,7 @@ def render_tab_content(active_tab):
                         html.Label('Entidad/Región:'),
                         dcc.Dropdown(
                             id='drop-entity',
-                            options=[{'label': entity, 'value': entity} for entity in ENTITIES],
+                            options=[{'label': entity, 'value': entity} for entity in data_loader.get('entities')],
                             value=DEFAULT_ENTITY,
                             multi=False
                         )
@@ -231,7 +237,7 @@ def render_tab_content(active_tab):
     Input('drop-entity', 'value')
 )
 def plot_lineplot(entities):
-    lineplot = plot_lineplot_db(entities, renewable_share_energy)
+    lineplot = plot_lineplot_db(entities, data_loader.get('renewable_share_energy'))
     return lineplot
 
 
@@ -240,7 +246,7 @@ def plot_lineplot(entities):
     Input('drop-entity', 'value')
 )
 def plot_scatterplot(entity):
-    scatterplot = plot_scatterplot_db(entity=entity, dataframe=share_electricity_renewables)
+    scatterplot = plot_scatterplot_db(entity=entity, dataframe=data_loader.get('share_electricity_renewables'))
     return scatterplot
 
 
@@ -250,7 +256,7 @@ def plot_scatterplot(entity):
     [Input('my-slider', 'value')]
 )
 def plot_barplot(value):
-    barplot = plot_barplot_db(value, renewable_share_energy)
+    barplot = plot_barplot_db(value, data_loader.get('renewable_share_energy'))
     return [f'Selected value: {value}'], barplot
 
 
@@ -260,7 +266,7 @@ def plot_barplot(value):
     [Input('slider-heatmap', 'value')]
 )
 def plot_heatmap(value):
-    barplot = plot_heatmap_db(value, renewable_share_energy)
+    barplot = plot_heatmap_db(value, data_loader.get('renewable_share_energy'))
     return [f'Selected value: {value}'], barplot
 
 
@@ -269,7 +275,7 @@ def plot_heatmap(value):
     [Input('interval-component-2', 'n_intervals')]
 )
 def scatterplot_multiple(n):
-    fig = scatterplot_multiple_db(share_electricity_renewables)
+    fig = scatterplot_multiple_db(data_loader.get('share_electricity_renewables'))
     return dcc.Graph(figure=fig)
 
 
@@ -278,7 +284,7 @@ def scatterplot_multiple(n):
     [Input('interval-component-3', 'n_intervals')]
 )
 def update_bar_plot_annual_renewable_rates(n):
-    fig = bar_plot_annual_renewable_rates_db(renewable_share_energy)
+    fig = bar_plot_annual_renewable_rates_db(data_loader.get('renewable_share_energy'))
     return dcc.Graph(figure=fig)
 
 
@@ -287,7 +293,7 @@ def update_bar_plot_annual_renewable_rates(n):
     [Input('interval-component', 'n_intervals')]
 )
 def map_plot(n):
-    fig = map_plot_db(share_electricity_renewables)
+    fig = map_plot_db(data_loader.get('share_electricity_renewables'))
     return dcc.Graph(figure=fig)
 
 
@@ -1,4 +1,18 @@
+import os
+
 TITLE_FONT_SIZE = 18
 LABEL_FONT_SIZE = 14
 LINE_WIDTH = 2.5
 DEFAULT_ENTITY = 'Mexico'
+
+# rutas de los datos (se pueden sobrescribir, p. ej. para usar datos sintéticos en load_test.py)
+RENEWABLE_SHARE_ENERGY_PATH = os.environ.get('RENEWABLE_SHARE_ENERGY_PATH',
+                                             "../data/01 renewable-share-energy.csv")
+SHARE_ELECTRICITY_RENEWABLES_PATH = os.environ.get('SHARE_ELECTRICITY_RENEWABLES_PATH',
+                                                   "../data/04 share-electricity-renewables.csv")
+
+# modo de arranque: 'eager' (carga al importar), 'background' (hilo en segundo plano) o 'lazy' (primer uso)
+STARTUP_MODE = os.environ.get('STARTUP_MODE', 'background')
+# presupuesto (segundos) para que un worker nuevo pueda responder y para que los datos estén listos
+STARTUP_BUDGET_SECONDS = float(os.environ.get('STARTUP_BUDGET_SECONDS', 3.0))
+READY_BUDGET_SECONDS = float(os.environ.get('READY_BUDGET_SECONDS', 15.0))
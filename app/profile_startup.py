@@ -0,0 +1,173 @@
+"""
+Measures the cold start of the dashboard in a fresh interpreter and checks it against a time budget.
+
+Usage (from the app/ directory):
+
+    python profile_startup.py [--mode background] [--top 15] [--budget 3.0] [--ready-budget 15.0]
+
+Prints the slowest imports (from `python -X importtime` in 'lazy' mode), the time until `main` is importable
+(i.e. until a new worker can answer requests) and the time until the data is fully loaded in the chosen mode.
+Exits with status 1 if either time goes over its budget or the app cannot start (e.g. missing data files).
+The same budgets are checked by tests/test_cold_start.py against generated data.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+# parametros globales
+from params import *
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# código ejecutado en el proceso hijo; la última línea de stdout es un JSON con los tiempos
+CHILD_CODE = '''
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+import data_loader
+data_loader.load()
+ready = time.perf_counter() - start
+print(json.dumps({"import_seconds": imported, "ready_seconds": ready, "status": data_loader.status()}))
+'''
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parses the output of `python -X importtime`.
+
+    Parameters
+    ----------
+    stderr : str
+        The standard error of the profiled process.
+
+    Returns
+    -------
+    list
+        A list of (cumulative_us, self_us, module) tuples sorted by cumulative time, slowest first.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def missing_data_files(env: dict) -> list:
+    """
+    Lists the data files the app would read that do not exist.
+
+    Parameters
+    ----------
+    env : dict
+        The environment of the profiled process, which may override the paths in params.py.
+
+    Returns
+    -------
+    list
+        The missing paths, resolved against the app/ directory.
+    """
+    paths = [env.get('RENEWABLE_SHARE_ENERGY_PATH', RENEWABLE_SHARE_ENERGY_PATH),
+             env.get('SHARE_ELECTRICITY_RENEWABLES_PATH', SHARE_ELECTRICITY_RENEWABLES_PATH)]
+    paths = [os.path.normpath(os.path.join(APP_DIR, path)) for path in paths]
+    return [path for path in paths if not os.path.exists(path)]
+
+
+def _run_child(args: list, env: dict) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable] + args, cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Application failed to start:\n{result.stderr[-2000:]}")
+    return result
+
+
+def profile_imports(env: dict = None) -> list:
+    """
+    Profiles `import main` with `python -X importtime` in 'lazy' mode.
+
+    In the other modes the loader thread imports pandas and plotly while `main` is still being imported,
+    and both show up interleaved in the profile, so the import table always comes from a lazy run.
+
+    Parameters
+    ----------
+    env : dict, optional
+        Environment variables added to the current environment of the child process.
+
+    Returns
+    -------
+    list
+        The parsed import-time profile (see `parse_importtime`).
+    """
+    env = {**os.environ, **(env or {}), 'STARTUP_MODE': 'lazy'}
+    result = _run_child(['-X', 'importtime', '-c', 'import main'], env)
+    return parse_importtime(result.stderr)
+
+
+def profile(mode: str, env: dict = None) -> dict:
+    """
+    Imports the application in a fresh interpreter and measures its startup times.
+
+    Parameters
+    ----------
+    mode : str
+        The startup mode passed to the child process through STARTUP_MODE.
+    env : dict, optional
+        Environment variables added to the current environment of the child process (e.g. the data paths).
+
+    Returns
+    -------
+    dict
+        The seconds until `main` is imported ('import_seconds') and until the data is loaded
+        ('ready_seconds'), plus the final loader status ('status').
+
+    Raises
+    ------
+    FileNotFoundError
+        If the data files the app would load do not exist.
+    """
+    env = {**os.environ, **(env or {}), 'STARTUP_MODE': mode}
+    missing = missing_data_files(env)
+    if missing:
+        raise FileNotFoundError(
+            f"Missing data files: {', '.join(missing)}. Put them in data/ or point "
+            f"RENEWABLE_SHARE_ENERGY_PATH / SHARE_ELECTRICITY_RENEWABLES_PATH to them.")
+    result = _run_child(['-c', CHILD_CODE], env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mode', default=STARTUP_MODE, choices=['eager', 'background', 'lazy'])
+    parser.add_argument('--top', type=int, default=15, help='number of slowest imports to show')
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_SECONDS,
+                        help='maximum seconds until the app can serve requests')
+    parser.add_argument('--ready-budget', type=float, default=READY_BUDGET_SECONDS,
+                        help='maximum seconds until the data is fully loaded')
+    args = parser.parse_args()
+
+    try:
+        timings = profile(args.mode)
+        imports = profile_imports()
+    except (FileNotFoundError, RuntimeError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    print(f"{'cumulative [ms]':>16} {'self [ms]':>10}  module")
+    for cumulative_us, self_us, module in imports[:args.top]:
+        print(f"{cumulative_us / 1000:16.1f} {self_us / 1000:10.1f}  {module}")
+    print()
+    print(f"mode:          {args.mode}")
+    print(f"import main:   {timings['import_seconds']:.3f}s (budget {args.budget:.3f}s)")
+    print(f"data ready:    {timings['ready_seconds']:.3f}s (budget {args.ready_budget:.3f}s)")
+
+    over_budget = (timings['import_seconds'] > args.budget
+                   or timings['ready_seconds'] > args.ready_budget)
+    if over_budget:
+        print('Cold start is over budget', file=sys.stderr)
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,13 @@
-import pandas as pd
-from typing import Union
-#  herramienta de visualización de datos geoespaciales en Python
-import plotly.express as px
-import plotly.graph_objects as go
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union
 # parametros globales
 from params import *
 
+# pandas y plotly se importan dentro de cada función para no alargar el arranque de la aplicación
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def obtain_growth_rates(dataframe: pd.DataFrame) -> dict:
     """
@@ -53,6 +55,7 @@ def bar_plot_annual_renewable_rates(dataframe: pd.DataFrame):
         A Plotly figure object representing the bar plot showing the average annual growth rates of renewable 
         energy consumption for each continent.
     """
+    import plotly.graph_objects as go
     fig_bar = go.Figure()
 
     growth_rates = obtain_growth_rates(dataframe)
@@ -95,6 +98,7 @@ def plot_lineplot(entities: Union[list, str], dataframe: pd.DataFrame):
         A Plotly figure object representing the line plot showing the trend of renewable energy consumption 
         over time for the specified entities.
     """
+    import plotly.express as px
     if not isinstance(entities, list):
         entities = [entities]
     data_copy = dataframe.copy()
@@ -136,8 +140,10 @@ def get_pivot_table(dataframe: pd.DataFrame, year: int) -> pd.DataFrame:
     """
     latest_n_years = dataframe['Year'].unique()[-year:]
     filtered_data = dataframe[dataframe['Year'].isin(latest_n_years)]
-    top_20_per_year = filtered_data.groupby('Year').apply(
-        lambda x: x.nlargest(20, 'Renewables (% equivalent primary energy)'))
+    # ordenar y tomar las 20 primeras filas por año conserva la columna 'Year', que
+    # groupby().apply() ya no pasa a la función desde pandas 3
+    top_20_per_year = filtered_data.sort_values(
+        'Renewables (% equivalent primary energy)', ascending=False, kind='stable').groupby('Year').head(20)
 
     # reorganizamos los datos en el DataFrame, de este forma tenemos una serie de tiempo
     pivot_data = top_20_per_year.pivot(
@@ -171,6 +177,7 @@ def plot_barplot(value: int, dataframe: pd.DataFrame):
         A Plotly figure object representing the stacked bar plot showing the renewable energy consumption 
         percentage for the top 20 entities over the specified number of latest years.
     """
+    import plotly.express as px
 
     sorted_pivot_data = get_pivot_table(dataframe, value)
     barplot = px.bar(sorted_pivot_data, barmode='stack',
@@ -209,6 +216,7 @@ def lowest_renewable_share(value: int, dataframe: pd.DataFrame):
         for each year in the specified range. The DataFrame has countries as index and years as columns.
         A numpy array containing the latest n years considered for retrieving the data.
     """
+    import pandas as pd
     latest_n_years = dataframe['Year'].unique()[-value:]
 
     heatmap_data = pd.DataFrame()
@@ -242,6 +250,7 @@ def plot_heatmap(value: int, dataframe: pd.DataFrame):
         A Plotly figure object representing the heatmap showing the renewable energy consumption percentage 
         for the bottom 10 countries/regions over the latest n years.
     """
+    import plotly.graph_objects as go
     heatmap_data, latest_n_years = lowest_renewable_share(value, dataframe)
     heatmap_fig = go.Figure(data=go.Heatmap(
         z=heatmap_data.values.tolist(),
@@ -284,6 +293,7 @@ def plot_scatterplot(entity: str, dataframe: pd.DataFrame):
         A Plotly figure object representing the scatter plot showing the trend of renewable energy usage rate 
         in the specified entity over the years.
     """
+    import plotly.graph_objects as go
     entity_data = dataframe[dataframe['Entity'] == entity]
 
     fig_scatter = go.Figure(go.Scatter(
@@ -336,6 +346,7 @@ def scatterplot_multiple(dataframes: pd.DataFrame):
         A Plotly figure object representing the scatter plot showing the trend of renewable energy usage rates 
         for multiple countries over the years.
     """
+    import plotly.graph_objects as go
     interest_countries = ['Germany', 'France', 'United Kingdom', 'Denmark', 'Spain', 'Mexico']
 
     selected_data = dataframes[dataframes['Entity'].isin(interest_countries)]
@@ -379,6 +390,7 @@ def map_plot(dataframe: pd.DataFrame):
         A Plotly figure object representing the choropleth map showing the worldwide distribution of renewable 
         energy usage percentage over the years.
     """
+    import plotly.express as px
     sorted_dataframe = dataframe.sort_values('Year')
     fig = px.choropleth(
         sorted_dataframe,
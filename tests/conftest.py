@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# los módulos de la aplicación se importan desde app/, igual que al ejecutar main.py
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+sys.path.insert(0, APP_DIR)
+
+
+@pytest.fixture
+def app_dir():
+    return APP_DIR
@@ -0,0 +1,22 @@
+import pytest
+
+from load_test import write_synthetic_data
+from params import READY_BUDGET_SECONDS, STARTUP_BUDGET_SECONDS
+from profile_startup import profile
+
+DATA_VARIABLES = ['RENEWABLE_SHARE_ENERGY_PATH', 'SHARE_ELECTRICITY_RENEWABLES_PATH']
+
+
+def test_missing_data_files_are_reported(tmp_path):
+    env = {variable: str(tmp_path / 'missing.csv') for variable in DATA_VARIABLES}
+    with pytest.raises(FileNotFoundError, match='Missing data files'):
+        profile('background', env)
+
+
+def test_cold_start_within_budget(tmp_path):
+    for module in ('dash', 'dash_bootstrap_components', 'pandas', 'plotly'):
+        pytest.importorskip(module)
+    timings = profile('background', write_synthetic_data(str(tmp_path)))
+    assert timings['status']['ready']
+    assert timings['import_seconds'] <= STARTUP_BUDGET_SECONDS
+    assert timings['ready_seconds'] <= READY_BUDGET_SECONDS
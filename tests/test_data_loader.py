@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# simula `gunicorn --preload`: el proceso padre bifurca mientras el hilo cargador trabaja o antes de que empiece
+FORK_CODE = '''
+import os, sys, time
+import data_loader
+
+def fake_step(step):
+    time.sleep(0.05)
+    data_loader._data[step] = step
+
+data_loader._run_step = fake_step
+if sys.argv[1] == 'running':
+    data_loader.start('background')
+else:
+    data_loader._state.update(mode='background', status='loading')
+pid = os.fork()
+if pid == 0:
+    os._exit(0 if data_loader.wait(5) and data_loader.get('entities') == 'entities' else 1)
+sys.exit(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]))
+'''
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+@pytest.mark.parametrize('scenario', ['running', 'not_started'])
+def test_background_load_completes_in_forked_child(scenario, app_dir):
+    result = subprocess.run([sys.executable, '-c', FORK_CODE, scenario], cwd=app_dir,
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
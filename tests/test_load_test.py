@@ -0,0 +1,92 @@
+import pytest
+
+from load_test import CALLBACKS, SLIDER_VALUES, TABS, build_payload, percentile, summarize, write_synthetic_data
+
+# un valor realista para la entrada de cada callback
+INPUT_VALUES = {
+    'render_tab_content': 'line-plot-tab',
+    'plot_lineplot': ['Mexico', 'Germany'],
+    'plot_scatterplot': 'Mexico',
+    'plot_barplot': 10,
+    'plot_heatmap': 6,
+    'scatterplot_multiple': 1,
+    'update_bar_plot_annual_renewable_rates': 1,
+    'map_plot': 1,
+}
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    for module in ('dash', 'dash_bootstrap_components', 'pandas', 'plotly'):
+        pytest.importorskip(module)
+    import data_loader
+    env = write_synthetic_data(str(tmp_path_factory.mktemp('data')), entities=60)
+    # apuntamos el cargador a los datos sintéticos antes de que main arranque la carga
+    data_loader.DATASETS.update(renewable_share_energy=env['RENEWABLE_SHARE_ENERGY_PATH'],
+                                share_electricity_renewables=env['SHARE_ELECTRICITY_RENEWABLES_PATH'])
+    import main
+    data_loader.load()
+    return main.server.test_client()
+
+
+def post(client, callback, value):
+    return client.post('/_dash-update-component', json=build_payload(callback, value))
+
+
+@pytest.mark.parametrize('callback', sorted(CALLBACKS))
+def test_callback_payload_is_accepted(client, callback):
+    response = post(client, callback, INPUT_VALUES[callback])
+    assert response.status_code == 200, response.get_data(as_text=True)[-2000:]
+
+
+@pytest.mark.parametrize('tab', sorted(TABS))
+def test_tab_payloads_are_accepted(client, tab):
+    assert post(client, 'render_tab_content', tab).status_code == 200
+    for callback, value in TABS[tab]:
+        response = post(client, callback, value)
+        assert response.status_code == 200, response.get_data(as_text=True)[-2000:]
+
+
+@pytest.mark.parametrize('value', SLIDER_VALUES)
+def test_slider_values_are_accepted(client, value):
+    assert post(client, 'plot_barplot', value).status_code == 200
+    assert post(client, 'plot_heatmap', value).status_code == 200
+
+
+def test_health_reports_ready(client):
+    response = client.get('/health')
+    assert response.status_code == 200
+    assert response.get_json()['ready'] is True
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([1, 2, 3, 4], 50) == 2
+
+
+def test_summarize_filters_window_and_adds_total():
+    results = [
+        ('plot_lineplot', 0.5, 0.010, True),   # antes de la ventana
+        ('plot_lineplot', 1.0, 0.020, True),
+        ('plot_lineplot', 2.0, 0.040, False),
+        ('plot_barplot', 2.5, 0.030, True),
+        ('plot_barplot', 3.0, 0.090, True),    # al final de la ventana, excluido
+    ]
+    report = summarize(results, start=1.0, end=3.0)
+
+    assert sorted(report) == ['TOTAL', 'plot_barplot', 'plot_lineplot']
+    assert list(report)[-1] == 'TOTAL'
+    assert report['plot_lineplot']['requests'] == 2
+    assert report['plot_lineplot']['errors'] == 1
+    # las peticiones fallidas no cuentan en el throughput ni en las latencias
+    assert report['plot_lineplot']['throughput'] == pytest.approx(0.5)
+    assert report['plot_lineplot']['max'] == pytest.approx(20.0)
+    assert report['TOTAL']['requests'] == 3
+    assert report['TOTAL']['errors'] == 1
+    assert report['TOTAL']['throughput'] == pytest.approx(1.0)
+    assert report['TOTAL']['p50'] == pytest.approx(20.0)
+    assert report['TOTAL']['max'] == pytest.approx(30.0)